@@ -5,18 +5,33 @@ Graphiti MCP Server - Exposes Graphiti functionality through the Model Context P
 
 import argparse
 import asyncio
+import hmac
+import json
 import logging
 import os
+import platform
+import re
 import sys
+import time
 from collections.abc import Callable
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone
+from functools import lru_cache
 from typing import Any, TypedDict, cast
 
-from azure.identity import DefaultAzureCredential, get_bearer_token_provider
+import uvicorn
 from dotenv import load_dotenv
 from mcp.server.fastmcp import FastMCP
+from mcp.server.lowlevel import Server as MCPServer
+from mcp.server.sse import SseServerTransport
 from openai import AsyncAzureOpenAI
 from pydantic import BaseModel, Field
+from sse_starlette.sse import EventSourceResponse
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Mount, Route
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from graphiti_core import Graphiti
 from graphiti_core.edges import EntityEdge
@@ -47,6 +62,26 @@ DEFAULT_EMBEDDER_MODEL = 'text-embedding-3-small'
 # Increase if you have high rate limits.
 SEMAPHORE_LIMIT = int(os.getenv('SEMAPHORE_LIMIT', 10))
 
+# Maximum number of concurrent SSE connections per process. Extra connections are
+# rejected with a 503 instead of queueing. 0 disables the limit.
+SSE_MAX_CONCURRENCY = int(os.getenv('SSE_MAX_CONCURRENCY', 0))
+
+# Seconds between SSE keepalive pings. Lower this if a proxy in front of the server closes
+# idle connections sooner, e.g. during long LLM calls. Must be greater than 0.
+SSE_PING_INTERVAL = float(os.getenv('SSE_PING_INTERVAL', 15))
+
+# Window in milliseconds for batching SSE events into a single write. 0 disables batching.
+SSE_COALESCE_MS = float(os.getenv('SSE_COALESCE_MS', 0))
+
+# Seconds an SSE connection waits for Graphiti to finish initializing before receiving a 503.
+MCP_STARTUP_TIMEOUT = float(os.getenv('MCP_STARTUP_TIMEOUT', 30))
+
+# Bearer token required by the /admin endpoints. The admin API is disabled when unset.
+MCP_ADMIN_TOKEN = os.getenv('MCP_ADMIN_TOKEN')
+
+# Minimum Linux kernel version for the io_uring event loop (IORING_OP_PROVIDE_BUFFERS).
+MIN_IO_URING_KERNEL = (5, 11)
+
 
 class Requirement(BaseModel):
     """A Requirement represents a specific need, feature, or functionality that a product or service must fulfill.
@@ -167,7 +202,13 @@ class StatusResponse(TypedDict):
     message: str
 
 
+@lru_cache(maxsize=1)
 def create_azure_credential_token_provider() -> Callable[[], str]:
+    # Cached so the LLM and embedder clients share one credential chain and token cache.
+    # azure.identity is imported here because it is slow to import and only needed for
+    # managed identity authentication.
+    from azure.identity import DefaultAzureCredential, get_bearer_token_provider
+
     credential = DefaultAzureCredential()
     token_provider = get_bearer_token_provider(
         credential, 'https://cognitiveservices.azure.com/.default'
@@ -520,6 +561,223 @@ class MCPConfig(BaseModel):
         return cls(transport=args.transport)
 
 
+class AdmissionController:
+    """Limits the number of concurrent Graphiti operations.
+
+    Works like an asyncio.Semaphore, but the limit can be changed at runtime: the admission
+    check (active < limit) is re-evaluated under an asyncio.Condition, so raising the limit
+    admits waiters immediately and lowering it lets in-flight operations drain.
+    """
+
+    def __init__(self, limit: int):
+        if limit < 1:
+            raise ValueError('Concurrency limit must be at least 1')
+        self._limit = limit
+        self._active = 0
+        self._cond = asyncio.Condition()
+
+    @property
+    def limit(self) -> int:
+        return self._limit
+
+    @property
+    def active(self) -> int:
+        return self._active
+
+    async def acquire(self):
+        async with self._cond:
+            try:
+                await self._cond.wait_for(lambda: self._active < self._limit)
+            except asyncio.CancelledError:
+                # This waiter may have consumed the wakeup for a free slot; pass it on so the
+                # next waiter is not stranded
+                if self._active < self._limit:
+                    self._cond.notify(1)
+                raise
+            self._active += 1
+
+    async def release(self):
+        # Decrement before awaiting so a cancellation here cannot leak a slot, and shield the
+        # wakeup so it is still delivered if release() itself is cancelled
+        self._active -= 1
+        await asyncio.shield(self._notify_waiter())
+
+    async def _notify_waiter(self):
+        async with self._cond:
+            self._cond.notify(1)
+
+    async def set_limit(self, limit: int):
+        if limit < 1:
+            raise ValueError('Concurrency limit must be at least 1')
+        async with self._cond:
+            self._limit = limit
+            self._cond.notify_all()
+
+    async def __aenter__(self) -> 'AdmissionController':
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.release()
+
+
+class SSEEndpoint:
+    """Raw ASGI endpoint that runs an MCP session over an SSE connection.
+
+    Routed as an ASGI app rather than a request/response endpoint, so the SSE stream is the
+    only response sent on the connection.
+    """
+
+    def __init__(self, server: MCPServer, transport: SseServerTransport):
+        self.server = server
+        self.transport = transport
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        async with self.transport.connect_sse(scope, receive, send) as (read_stream, write_stream):
+            await self.server.run(
+                read_stream, write_stream, self.server.create_initialization_options()
+            )
+
+
+class ConcurrencyLimitMiddleware:
+    """ASGI middleware that sheds SSE connections once the per-process limit is reached.
+
+    Only requests to the SSE endpoint are counted; message posts and other routes pass through.
+    Rejected connections get an immediate 503 so clients can retry instead of piling up.
+    """
+
+    def __init__(self, app: ASGIApp, limit: int, path: str = '/sse'):
+        self.app = app
+        self.limit = limit
+        self.path = path
+        self.active = 0
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope['type'] != 'http' or scope['path'] != self.path or self.limit <= 0:
+            await self.app(scope, receive, send)
+            return
+
+        if self.active >= self.limit:
+            response = JSONResponse(
+                {'error': 'overloaded'}, status_code=503, headers={'Retry-After': '1'}
+            )
+            await response(scope, receive, send)
+            return
+
+        self.active += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.active -= 1
+
+
+class SSECoalescingMiddleware:
+    """ASGI middleware that batches SSE body chunks into fewer socket writes.
+
+    Chunks sent within max_delay seconds of the first buffered chunk are joined and written
+    together, up to max_events chunks per write. Whole SSE events are concatenated rather than
+    merged, so the event framing seen by the client is unchanged. Clients can opt out by
+    sending 'Accept: text/event-stream; no-buffer'.
+    """
+
+    def __init__(self, app: ASGIApp, max_delay: float, max_events: int = 16, path: str = '/sse'):
+        self.app = app
+        self.max_delay = max_delay
+        self.max_events = max_events
+        self.path = path
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if (
+            scope['type'] != 'http'
+            or scope['path'] != self.path
+            or self.max_delay <= 0
+            or b'no-buffer' in dict(scope['headers']).get(b'accept', b'')
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        buffer: list[bytes] = []
+        lock = asyncio.Lock()
+        flush_task: asyncio.Task | None = None
+
+        async def flush():
+            nonlocal flush_task
+            # A delayed flush keeps its own reference so a failed write can be reported later
+            if flush_task is not asyncio.current_task():
+                if flush_task is not None:
+                    flush_task.cancel()
+                flush_task = None
+            if buffer:
+                body = b''.join(buffer)
+                buffer.clear()
+                await send({'type': 'http.response.body', 'body': body, 'more_body': True})
+
+        async def flush_after_delay():
+            await asyncio.sleep(self.max_delay)
+            async with lock:
+                await flush()
+
+        async def coalescing_send(message: Message):
+            nonlocal flush_task
+            async with lock:
+                if flush_task is not None and flush_task.done():
+                    # Surface a failed delayed write (e.g. the client disconnected) to the app
+                    finished, flush_task = flush_task, None
+                    finished.result()
+
+                if message['type'] == 'http.response.body' and message.get('more_body', False):
+                    buffer.append(message.get('body', b''))
+                    if len(buffer) >= self.max_events:
+                        await flush()
+                    elif flush_task is None:
+                        flush_task = asyncio.create_task(flush_after_delay())
+                    return
+
+                await flush()
+                await send(message)
+
+        try:
+            await self.app(scope, receive, coalescing_send)
+        finally:
+            if flush_task is not None:
+                flush_task.cancel()
+                # Retrieve the outcome so an error from the last delayed write is not reported
+                # as a never-retrieved task exception
+                await asyncio.wait([flush_task])
+                if not flush_task.cancelled():
+                    flush_task.exception()
+
+
+class ReadinessGateMiddleware:
+    """ASGI middleware that holds SSE connections until the server is ready.
+
+    The server starts accepting connections while Graphiti initializes in the background.
+    SSE connections wait up to `timeout` seconds for the `ready` event and then get a 503;
+    all other routes, including the health check, are served immediately.
+    """
+
+    def __init__(self, app: ASGIApp, ready: asyncio.Event, timeout: float, path: str = '/sse'):
+        self.app = app
+        self.ready = ready
+        self.timeout = timeout
+        self.path = path
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope['type'] == 'http' and scope['path'] == self.path and not self.ready.is_set():
+            try:
+                await asyncio.wait_for(self.ready.wait(), timeout=self.timeout)
+            except asyncio.TimeoutError:
+                response = JSONResponse(
+                    {'error': 'Graphiti is still initializing'},
+                    status_code=503,
+                    headers={'Retry-After': '5'},
+                )
+                await response(scope, receive, send)
+                return
+
+        await self.app(scope, receive, send)
+
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -571,59 +829,79 @@ mcp = FastMCP(
 # Initialize Graphiti client
 graphiti_client: Graphiti | None = None
 
+# Set once the Graphiti client has been initialized and the server can accept SSE sessions
+graphiti_ready = asyncio.Event()
+
+# Admission control for LLM and embedder backed operations, resizable via /admin/concurrency
+admission = AdmissionController(SEMAPHORE_LIMIT)
+
 
 async def initialize_graphiti():
     """Initialize the Graphiti client with the configured settings."""
     global graphiti_client, config
 
-    try:
-        # Create LLM client if possible
-        llm_client = config.llm.create_client()
-        if not llm_client and config.use_custom_entities:
-            # If custom entities are enabled, we must have an LLM client
-            raise ValueError('OPENAI_API_KEY must be set when custom entities are enabled')
-
-        # Validate Neo4j configuration
-        if not config.neo4j.uri or not config.neo4j.user or not config.neo4j.password:
-            raise ValueError('NEO4J_URI, NEO4J_USER, and NEO4J_PASSWORD must be set')
-
-        embedder_client = config.embedder.create_client()
-
-        # Initialize Graphiti client
-        graphiti_client = Graphiti(
-            uri=config.neo4j.uri,
-            user=config.neo4j.user,
-            password=config.neo4j.password,
-            llm_client=llm_client,
-            embedder=embedder_client,
-            max_coroutines=SEMAPHORE_LIMIT,
-        )
+    # Create LLM client if possible
+    llm_client = config.llm.create_client()
+    if not llm_client and config.use_custom_entities:
+        # If custom entities are enabled, we must have an LLM client
+        raise ValueError('OPENAI_API_KEY must be set when custom entities are enabled')
+
+    # Validate Neo4j configuration
+    if not config.neo4j.uri or not config.neo4j.user or not config.neo4j.password:
+        raise ValueError('NEO4J_URI, NEO4J_USER, and NEO4J_PASSWORD must be set')
+
+    embedder_client = config.embedder.create_client()
+
+    # Initialize Graphiti client
+    graphiti_client = Graphiti(
+        uri=config.neo4j.uri,
+        user=config.neo4j.user,
+        password=config.neo4j.password,
+        llm_client=llm_client,
+        embedder=embedder_client,
+        max_coroutines=SEMAPHORE_LIMIT,
+    )
 
-        # Destroy graph if requested
-        if config.destroy_graph:
-            logger.info('Destroying graph...')
-            await clear_data(graphiti_client.driver)
+    # Destroy graph if requested
+    if config.destroy_graph:
+        logger.info('Destroying graph...')
+        await clear_data(graphiti_client.driver)
+
+    # Initialize the graph database with Graphiti's indices. This is the only step that
+    # waits on I/O; the LLM and embedder clients connect lazily on first use.
+    start = time.perf_counter()
+    await graphiti_client.build_indices_and_constraints()
+    graphiti_ready.set()
+    logger.info(
+        f'Graphiti client initialized successfully '
+        f'(indices built in {time.perf_counter() - start:.2f}s)'
+    )
 
-        # Initialize the graph database with Graphiti's indices
-        await graphiti_client.build_indices_and_constraints()
-        logger.info('Graphiti client initialized successfully')
+    # Log the effective configuration in a single record
+    logger.info(
+        f'Graphiti configuration: model={config.llm.model if llm_client else None}, '
+        f'temperature={config.llm.temperature}, group_id={config.group_id}, '
+        f'custom_entities={"enabled" if config.use_custom_entities else "disabled"}, '
+        f'concurrency_limit={SEMAPHORE_LIMIT}'
+    )
+    if not llm_client:
+        logger.info('No LLM client configured - entity extraction will be limited')
 
-        # Log configuration details for transparency
-        if llm_client:
-            logger.info(f'Using OpenAI model: {config.llm.model}')
-            logger.info(f'Using temperature: {config.llm.temperature}')
-        else:
-            logger.info('No LLM client configured - entity extraction will be limited')
 
-        logger.info(f'Using group_id: {config.group_id}')
-        logger.info(
-            f'Custom entity extraction: {"enabled" if config.use_custom_entities else "disabled"}'
-        )
-        logger.info(f'Using concurrency limit: {SEMAPHORE_LIMIT}')
+async def close_graphiti():
+    """Close the Graphiti client and its Neo4j driver, if one was created."""
+    global graphiti_client
 
-    except Exception as e:
-        logger.error(f'Failed to initialize Graphiti: {str(e)}')
-        raise
+    if graphiti_client is None:
+        return
+
+    client = graphiti_client
+    graphiti_client = None
+    graphiti_ready.clear()
+    # Workers may still be writing episodes; stop them before the driver goes away
+    await stop_episode_queue_workers()
+    await client.close()
+    logger.info('Graphiti client closed')
 
 
 def format_fact_result(edge: EntityEdge) -> dict[str, Any]:
@@ -650,8 +928,8 @@ def format_fact_result(edge: EntityEdge) -> dict[str, Any]:
 # Dictionary to store queues for each group_id
 # Each queue is a list of tasks to be processed sequentially
 episode_queues: dict[str, asyncio.Queue] = {}
-# Dictionary to track if a worker is running for each group_id
-queue_workers: dict[str, bool] = {}
+# Dictionary to track the running worker task for each group_id
+queue_workers: dict[str, asyncio.Task] = {}
 
 
 async def process_episode_queue(group_id: str):
@@ -663,7 +941,6 @@ async def process_episode_queue(group_id: str):
     global queue_workers
 
     logger.info(f'Starting episode queue worker for group_id: {group_id}')
-    queue_workers[group_id] = True
 
     try:
         while True:
@@ -684,10 +961,18 @@ async def process_episode_queue(group_id: str):
     except Exception as e:
         logger.error(f'Unexpected error in queue worker for group_id {group_id}: {str(e)}')
     finally:
-        queue_workers[group_id] = False
+        queue_workers.pop(group_id, None)
         logger.info(f'Stopped episode queue worker for group_id: {group_id}')
 
 
+async def stop_episode_queue_workers():
+    """Cancel the episode queue workers and wait for them to finish."""
+    workers = list(queue_workers.values())
+    for worker in workers:
+        worker.cancel()
+    await asyncio.gather(*workers, return_exceptions=True)
+
+
 @mcp.tool()
 async def add_memory(
     name: str,
@@ -786,16 +1071,17 @@ async def add_memory(
                 # Use all entity types if use_custom_entities is enabled, otherwise use empty dict
                 entity_types = ENTITY_TYPES if config.use_custom_entities else {}
 
-                await client.add_episode(
-                    name=name,
-                    episode_body=episode_body,
-                    source=source_type,
-                    source_description=source_description,
-                    group_id=group_id_str,  # Using the string version of group_id
-                    uuid=uuid,
-                    reference_time=datetime.now(timezone.utc),
-                    entity_types=entity_types,
-                )
+                async with admission:
+                    await client.add_episode(
+                        name=name,
+                        episode_body=episode_body,
+                        source=source_type,
+                        source_description=source_description,
+                        group_id=group_id_str,  # Using the string version of group_id
+                        uuid=uuid,
+                        reference_time=datetime.now(timezone.utc),
+                        entity_types=entity_types,
+                    )
                 logger.info(f"Episode '{name}' added successfully")
 
                 logger.info(f"Episode '{name}' processed successfully")
@@ -813,8 +1099,8 @@ async def add_memory(
         await episode_queues[group_id_str].put(process_episode)
 
         # Start a worker for this queue if one isn't already running
-        if not queue_workers.get(group_id_str, False):
-            asyncio.create_task(process_episode_queue(group_id_str))
+        if group_id_str not in queue_workers:
+            queue_workers[group_id_str] = asyncio.create_task(process_episode_queue(group_id_str))
 
         # Return immediately with a success message
         return SuccessResponse(
@@ -875,13 +1161,14 @@ async def search_memory_nodes(
         client = cast(Graphiti, graphiti_client)
 
         # Perform the search using the _search method
-        search_results = await client._search(
-            query=query,
-            config=search_config,
-            group_ids=effective_group_ids,
-            center_node_uuid=center_node_uuid,
-            search_filter=filters,
-        )
+        async with admission:
+            search_results = await client._search(
+                query=query,
+                config=search_config,
+                group_ids=effective_group_ids,
+                center_node_uuid=center_node_uuid,
+                search_filter=filters,
+            )
 
         if not search_results.nodes:
             return NodeSearchResponse(message='No relevant nodes found', nodes=[])
@@ -943,12 +1230,13 @@ async def search_memory_facts(
         # Use cast to help the type checker understand that graphiti_client is not None
         client = cast(Graphiti, graphiti_client)
 
-        relevant_edges = await client.search(
-            group_ids=effective_group_ids,
-            query=query,
-            num_results=max_facts,
-            center_node_uuid=center_node_uuid,
-        )
+        async with admission:
+            relevant_edges = await client.search(
+                group_ids=effective_group_ids,
+                query=query,
+                num_results=max_facts,
+                center_node_uuid=center_node_uuid,
+            )
 
         if not relevant_edges:
             return FactSearchResponse(message='No relevant facts found', facts=[])
@@ -1159,10 +1447,47 @@ async def get_status() -> StatusResponse:
         )
 
 
-async def initialize_server() -> MCPConfig:
-    """Parse CLI arguments and initialize the Graphiti server configuration."""
-    global config
+# /healthz bodies are static, so serialize them once instead of on every probe
+HEALTHZ_READY_BODY = json.dumps({'ready': True}).encode()
+HEALTHZ_STARTING_BODY = json.dumps({'ready': False}).encode()
+
+
+async def healthz(request: Request) -> Response:
+    """Liveness probe that also reports whether Graphiti has finished initializing."""
+    body = HEALTHZ_READY_BODY if graphiti_ready.is_set() else HEALTHZ_STARTING_BODY
+    return Response(body, media_type='application/json')
+
 
+async def admin_concurrency(request: Request) -> Response:
+    """Inspect or resize the concurrency limit for Graphiti operations.
+
+    POST a JSON body such as {"limit": 20} to change the limit without restarting the server.
+    Requests must send MCP_ADMIN_TOKEN as a bearer token.
+    """
+    if not MCP_ADMIN_TOKEN:
+        return JSONResponse({'error': 'Admin API disabled'}, status_code=404)
+
+    authorization = request.headers.get('authorization', '')
+    if not hmac.compare_digest(authorization.encode(), f'Bearer {MCP_ADMIN_TOKEN}'.encode()):
+        return JSONResponse({'error': 'Unauthorized'}, status_code=401)
+
+    if request.method == 'POST':
+        try:
+            body = await request.json()
+            limit = body['limit']
+            # bool is a subclass of int, and int() would silently truncate floats
+            if not isinstance(limit, int) or isinstance(limit, bool):
+                raise TypeError('limit must be an integer')
+            await admission.set_limit(limit)
+        except (ValueError, KeyError, TypeError) as e:
+            return JSONResponse({'error': f'Invalid concurrency limit: {e}'}, status_code=400)
+        logger.info(f'Concurrency limit set to {admission.limit}')
+
+    return JSONResponse({'limit': admission.limit, 'active': admission.active})
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse command line arguments for the server, from sys.argv unless argv is given."""
     parser = argparse.ArgumentParser(
         description='Run the Graphiti MCP server with optional LLM client'
     )
@@ -1171,11 +1496,14 @@ async def initialize_server() -> MCPConfig:
         help='Namespace for the graph. This is an arbitrary string used to organize related data. '
         'If not provided, a random UUID will be generated.',
     )
+    transports = ['sse', 'stdio']
+    default_transport = os.environ.get('MCP_TRANSPORT', 'sse')
     parser.add_argument(
         '--transport',
-        choices=['sse', 'stdio'],
-        default='sse',
-        help='Transport to use for communication with the client. (default: sse)',
+        choices=transports,
+        default=default_transport,
+        help='Transport to use for communication with the client. '
+        '(default: MCP_TRANSPORT environment variable or sse)',
     )
     parser.add_argument(
         '--model', help=f'Model name to use with the LLM client. (default: {DEFAULT_LLM_MODEL})'
@@ -1201,25 +1529,29 @@ async def initialize_server() -> MCPConfig:
         help='Host to bind the MCP server to (default: MCP_SERVER_HOST environment variable)',
     )
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+    # argparse does not check defaults against choices
+    if args.transport not in transports:
+        parser.error(
+            f'invalid MCP_TRANSPORT: {default_transport!r} (choose from {", ".join(transports)})'
+        )
+    return args
 
-    # Build configuration from CLI arguments and environment variables
-    config = GraphitiConfig.from_cli_and_env(args)
 
-    # Log the group ID configuration
-    if args.group_id:
-        logger.info(f'Using provided group_id: {config.group_id}')
-    else:
-        logger.info(f'Generated random group_id: {config.group_id}')
+async def initialize_server(args: argparse.Namespace | None = None) -> MCPConfig:
+    """Initialize the Graphiti server configuration.
 
-    # Log entity extraction configuration
-    if config.use_custom_entities:
-        logger.info('Entity extraction enabled using predefined ENTITY_TYPES')
-    else:
-        logger.info('Entity extraction disabled (no custom entities will be used)')
+    Args:
+        args: Parsed arguments, e.g. from parse_args(). Parsed from sys.argv when not provided,
+              so embedding callers can configure the server without rewriting sys.argv.
+    """
+    global config
 
-    # Initialize Graphiti
-    await initialize_graphiti()
+    if args is None:
+        args = parse_args()
+
+    # Build configuration from CLI arguments and environment variables
+    config = GraphitiConfig.from_cli_and_env(args)
 
     if args.host:
         logger.info(f'Setting MCP server host to: {args.host}')
@@ -1230,6 +1562,100 @@ async def initialize_server() -> MCPConfig:
     return MCPConfig.from_cli(args)
 
 
+@asynccontextmanager
+async def lifespan(app: Starlette):
+    yield
+    # Shutdown: stop a still-running initialization, then close the Neo4j driver once
+    # uvicorn has drained open connections
+    init_task: asyncio.Task | None = getattr(app.state, 'graphiti_init', None)
+    if init_task is not None and not init_task.done():
+        init_task.cancel()
+        # Let it unwind out of any index build or data clear before the driver is closed
+        await asyncio.gather(init_task, return_exceptions=True)
+    await close_graphiti()
+
+
+def create_sse_app() -> Starlette:
+    """Build the Starlette app for the SSE transport.
+
+    Equivalent to FastMCP.sse_app(), except that the SSE route goes straight to the transport's
+    ASGI handler. FastMCP wraps it in a request/response endpoint that tries to send a second,
+    empty response once the stream closes.
+    """
+    sse = SseServerTransport(mcp.settings.message_path)
+
+    return Starlette(
+        debug=mcp.settings.debug,
+        routes=[
+            Route(
+                mcp.settings.sse_path,
+                endpoint=SSEEndpoint(mcp._mcp_server, sse),  # FastMCP has no public accessor
+                methods=['GET'],
+            ),
+            Mount(mcp.settings.message_path, app=sse.handle_post_message),
+            Route('/healthz', endpoint=healthz, methods=['GET']),
+            Route('/admin/concurrency', endpoint=admin_concurrency, methods=['GET', 'POST']),
+        ],
+        lifespan=lifespan,
+    )
+
+
+async def run_sse_server():
+    """Serve the MCP SSE app with uvicorn, tuned for long-lived SSE connections."""
+    # The MCP SSE transport streams through sse-starlette's EventSourceResponse, which already
+    # sends keepalive pings and the no-cache/X-Accel-Buffering headers; only the interval is ours
+    if SSE_PING_INTERVAL <= 0:
+        # 0 would send pings in a tight loop and sse-starlette rejects negatives per connection
+        raise ValueError(f'SSE_PING_INTERVAL must be greater than 0, got {SSE_PING_INTERVAL}')
+    EventSourceResponse.DEFAULT_PING_INTERVAL = SSE_PING_INTERVAL  # type: ignore
+
+    sse_app = create_sse_app()
+    app = SSECoalescingMiddleware(
+        sse_app, max_delay=SSE_COALESCE_MS / 1000, path=mcp.settings.sse_path
+    )
+    app = ReadinessGateMiddleware(
+        app, ready=graphiti_ready, timeout=MCP_STARTUP_TIMEOUT, path=mcp.settings.sse_path
+    )
+    app = ConcurrencyLimitMiddleware(app, limit=SSE_MAX_CONCURRENCY, path=mcp.settings.sse_path)
+
+    config = uvicorn.Config(
+        app,
+        host=mcp.settings.host,
+        port=mcp.settings.port,
+        log_level=mcp.settings.log_level.lower(),
+        backlog=4096,
+        timeout_keep_alive=5,
+        # Open SSE streams never finish on their own, so bound how long shutdown waits for them
+        timeout_graceful_shutdown=30,
+    )
+    server = uvicorn.Server(config)
+
+    async def load_graphiti():
+        try:
+            await initialize_graphiti()
+        except Exception:
+            # The server cannot do anything useful without Graphiti, so stop it
+            server.should_exit = True
+            raise
+
+    # Initialize Graphiti in the background so the server binds and answers health checks
+    # immediately; SSE connections are held by ReadinessGateMiddleware until it is ready
+    init_task = asyncio.create_task(load_graphiti())
+    sse_app.state.graphiti_init = init_task
+    try:
+        await server.serve()
+    finally:
+        if not init_task.done():
+            init_task.cancel()
+            await asyncio.gather(init_task, return_exceptions=True)
+        # uvicorn skips lifespan shutdown when it is stopped during startup; this is a no-op
+        # if the lifespan already closed the client
+        await close_graphiti()
+
+    if not init_task.cancelled():
+        init_task.result()
+
+
 async def run_mcp_server():
     """Run the MCP server in the current event loop."""
     # Initialize the server
@@ -1238,16 +1664,63 @@ async def run_mcp_server():
     # Run the server with stdio transport for MCP in the same event loop
     logger.info(f'Starting MCP server with transport: {mcp_config.transport}')
     if mcp_config.transport == 'stdio':
-        await mcp.run_stdio_async()
+        await initialize_graphiti()
+        try:
+            await mcp.run_stdio_async()
+        finally:
+            await close_graphiti()
     elif mcp_config.transport == 'sse':
         logger.info(
             f'Running MCP server with SSE transport on {mcp.settings.host}:{mcp.settings.port}'
         )
-        await mcp.run_sse_async()
+        await run_sse_server()
+    else:
+        raise ValueError(f'Unsupported transport: {mcp_config.transport}')
+
+
+def io_uring_supported() -> bool:
+    """Return True if the running kernel supports the io_uring features uringcore needs."""
+    if not sys.platform.startswith('linux'):
+        return False
+
+    match = re.match(r'(\d+)\.(\d+)', platform.release())
+    if match is None:
+        return False
+
+    return (int(match.group(1)), int(match.group(2))) >= MIN_IO_URING_KERNEL
+
+
+def install_event_loop_policy():
+    """Install the fastest available event loop policy for the server.
+
+    On Linux 5.11+ the io_uring-backed uringcore loop is used when it is installed, which
+    removes the per-chunk epoll_wait syscalls from long-lived SSE streams. Otherwise uvloop
+    replaces the pure-Python selector loop with a libuv-based implementation. If neither is
+    available the default asyncio event loop is used.
+    """
+    if io_uring_supported():
+        try:
+            import uringcore  # type: ignore
+        except ImportError:
+            logger.debug('uringcore not installed, skipping io_uring event loop')
+        else:
+            asyncio.set_event_loop_policy(uringcore.EventLoopPolicy())
+            logger.info('Using io_uring event loop (uringcore)')
+            return
+
+    try:
+        import uvloop
+    except ImportError:
+        logger.debug('uvloop not installed, using the default asyncio event loop')
+        return
+
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
 
 
 def main():
     """Main function to run the Graphiti MCP server."""
+    install_event_loop_policy()
+
     try:
         # Run everything in a single event loop
         asyncio.run(run_mcp_server())
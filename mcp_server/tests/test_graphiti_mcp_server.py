@@ -0,0 +1,390 @@
+import asyncio
+import gc
+
+import pytest
+
+pytest.importorskip('mcp')
+
+import graphiti_mcp_server  # noqa: E402
+import uvicorn  # noqa: E402
+from graphiti_mcp_server import (  # noqa: E402
+    AdmissionController,
+    ConcurrencyLimitMiddleware,
+    ReadinessGateMiddleware,
+    SSECoalescingMiddleware,
+)
+from starlette.testclient import TestClient  # noqa: E402
+
+
+async def _hold(admission: AdmissionController, entered: asyncio.Event, release: asyncio.Event):
+    async with admission:
+        entered.set()
+        await release.wait()
+
+
+async def test_admission_limits_concurrency():
+    admission = AdmissionController(1)
+    first_entered, second_entered = asyncio.Event(), asyncio.Event()
+    release_first, release_second = asyncio.Event(), asyncio.Event()
+
+    first = asyncio.create_task(_hold(admission, first_entered, release_first))
+    second = asyncio.create_task(_hold(admission, second_entered, release_second))
+    await first_entered.wait()
+    await asyncio.sleep(0)
+    assert admission.active == 1
+    assert not second_entered.is_set()
+
+    release_first.set()
+    await asyncio.wait_for(second_entered.wait(), timeout=1)
+    release_second.set()
+    await asyncio.gather(first, second)
+    assert admission.active == 0
+
+
+async def test_admission_cancelled_waiter_passes_on_wakeup():
+    admission = AdmissionController(1)
+    await admission.acquire()
+
+    cancelled_waiter = asyncio.create_task(admission.acquire())
+    await asyncio.sleep(0)
+    waiter_entered, waiter_release = asyncio.Event(), asyncio.Event()
+    waiter = asyncio.create_task(_hold(admission, waiter_entered, waiter_release))
+    await asyncio.sleep(0)
+
+    # Cancel the first waiter right after it is notified, before it gets to run
+    notify = admission._cond.notify
+
+    def notify_then_cancel(n: int = 1):
+        notify(n)
+        if not cancelled_waiter.cancelled():
+            cancelled_waiter.cancel()
+
+    admission._cond.notify = notify_then_cancel  # type: ignore[method-assign]
+    await admission.release()
+
+    await asyncio.wait_for(waiter_entered.wait(), timeout=1)
+    waiter_release.set()
+    await waiter
+    with pytest.raises(asyncio.CancelledError):
+        await cancelled_waiter
+    assert admission.active == 0
+
+
+async def test_admission_set_limit_grows_and_shrinks():
+    admission = AdmissionController(1)
+    releases = [asyncio.Event() for _ in range(3)]
+    entered = [asyncio.Event() for _ in range(3)]
+    tasks = [asyncio.create_task(_hold(admission, entered[i], releases[i])) for i in range(3)]
+    await entered[0].wait()
+    await asyncio.sleep(0)
+    assert admission.active == 1
+
+    # Growing the limit admits the waiters immediately
+    await admission.set_limit(3)
+    await asyncio.wait_for(asyncio.gather(entered[1].wait(), entered[2].wait()), timeout=1)
+    assert admission.active == 3
+
+    # Shrinking the limit lets in-flight operations drain before admitting new ones
+    await admission.set_limit(1)
+    late_entered, late_release = asyncio.Event(), asyncio.Event()
+    late = asyncio.create_task(_hold(admission, late_entered, late_release))
+    releases[0].set()
+    releases[1].set()
+    await asyncio.gather(tasks[0], tasks[1])
+    await asyncio.sleep(0)
+    assert admission.active == 1
+    assert not late_entered.is_set()
+
+    releases[2].set()
+    await asyncio.wait_for(late_entered.wait(), timeout=1)
+    late_release.set()
+    await asyncio.gather(tasks[2], late)
+    assert admission.active == 0
+
+
+async def test_admission_rejects_limit_below_one():
+    with pytest.raises(ValueError):
+        AdmissionController(0)
+    with pytest.raises(ValueError):
+        await AdmissionController(1).set_limit(0)
+
+
+@pytest.mark.parametrize('body', [{'limit': 1.9}, {'limit': True}, {'limit': '2'}, {}, [2]])
+def test_admin_concurrency_rejects_non_integer_limits(monkeypatch, body):
+    monkeypatch.setattr(graphiti_mcp_server, 'MCP_ADMIN_TOKEN', 'secret')
+    client = TestClient(graphiti_mcp_server.create_sse_app())
+    response = client.post(
+        '/admin/concurrency', json=body, headers={'Authorization': 'Bearer secret'}
+    )
+    assert response.status_code == 400
+    assert graphiti_mcp_server.admission.limit == graphiti_mcp_server.SEMAPHORE_LIMIT
+
+
+@pytest.mark.parametrize('interval', [0, -1])
+async def test_sse_server_rejects_non_positive_ping_interval(monkeypatch, interval):
+    monkeypatch.setattr(graphiti_mcp_server, 'SSE_PING_INTERVAL', interval)
+    with pytest.raises(ValueError, match='SSE_PING_INTERVAL'):
+        await graphiti_mcp_server.run_sse_server()
+
+
+def _sse_scope(accept: bytes = b'text/event-stream', path: str = '/sse') -> dict:
+    return {'type': 'http', 'path': path, 'headers': [(b'accept', accept)]}
+
+
+def _sse_app(chunks: list[bytes], pause: float = 0):
+    async def app(scope, receive, send):
+        await send({'type': 'http.response.start', 'status': 200, 'headers': []})
+        for chunk in chunks:
+            await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+            if pause:
+                await asyncio.sleep(pause)
+        await send({'type': 'http.response.body', 'body': b'', 'more_body': False})
+
+    return app
+
+
+async def _receive():
+    return {'type': 'http.disconnect'}
+
+
+async def _ignore(message):
+    pass
+
+
+async def test_sse_coalescing_batches_chunks_in_order():
+    chunks = [f'data: {i}\n\n'.encode() for i in range(40)]
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    middleware = SSECoalescingMiddleware(_sse_app(chunks), max_delay=0.05, max_events=16)
+    await middleware(_sse_scope(), _receive, send)
+
+    bodies = [m for m in sent if m['type'] == 'http.response.body']
+    # Two full batches, the remainder flushed ahead of the final message, then the final message
+    assert len(bodies) == 4
+    assert b''.join(m['body'] for m in bodies) == b''.join(chunks)
+    assert [m['more_body'] for m in bodies] == [True, True, True, False]
+
+
+async def test_sse_coalescing_flushes_after_delay():
+    chunks = [b'data: 1\n\n', b'data: 2\n\n']
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    middleware = SSECoalescingMiddleware(_sse_app(chunks, pause=0.05), max_delay=0.01)
+    await middleware(_sse_scope(), _receive, send)
+
+    bodies = [m['body'] for m in sent if m['type'] == 'http.response.body']
+    assert bodies == [b'data: 1\n\n', b'data: 2\n\n', b'']
+
+
+async def test_sse_coalescing_no_buffer_opt_out():
+    chunks = [f'data: {i}\n\n'.encode() for i in range(40)]
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    middleware = SSECoalescingMiddleware(_sse_app(chunks), max_delay=0.05)
+    await middleware(_sse_scope(b'text/event-stream; no-buffer'), _receive, send)
+
+    bodies = [m['body'] for m in sent if m['type'] == 'http.response.body']
+    assert bodies == [*chunks, b'']
+
+
+async def test_sse_coalescing_retrieves_failed_delayed_flush():
+    errors = []
+    asyncio.get_running_loop().set_exception_handler(lambda loop, context: errors.append(context))
+
+    async def send(message):
+        if message['type'] == 'http.response.body':
+            raise OSError('client disconnected')
+
+    async def app(scope, receive, send):
+        await send({'type': 'http.response.body', 'body': b'data: 1\n\n', 'more_body': True})
+        await asyncio.sleep(0.05)
+
+    await SSECoalescingMiddleware(app, max_delay=0.01)(_sse_scope(), _receive, send)
+    gc.collect()
+
+    assert errors == []
+
+
+async def test_close_graphiti_stops_queue_workers_before_closing_client(monkeypatch):
+    started = asyncio.Event()
+
+    async def process_episode():
+        started.set()
+        await asyncio.Event().wait()
+
+    class FakeClient:
+        async def close(self):
+            self.workers_running = [not w.done() for w in worker_tasks]
+
+    client = FakeClient()
+    monkeypatch.setattr(graphiti_mcp_server, 'graphiti_client', client)
+    monkeypatch.setitem(graphiti_mcp_server.episode_queues, 'test', asyncio.Queue())
+    graphiti_mcp_server.episode_queues['test'].put_nowait(process_episode)
+    worker = asyncio.create_task(graphiti_mcp_server.process_episode_queue('test'))
+    monkeypatch.setitem(graphiti_mcp_server.queue_workers, 'test', worker)
+    worker_tasks = [worker]
+    await started.wait()
+
+    await graphiti_mcp_server.close_graphiti()
+
+    assert client.workers_running == [False]
+    assert 'test' not in graphiti_mcp_server.queue_workers
+
+
+def test_parse_args_transport_from_env(monkeypatch):
+    monkeypatch.setenv('MCP_TRANSPORT', 'stdio')
+    assert graphiti_mcp_server.parse_args([]).transport == 'stdio'
+
+
+@pytest.mark.parametrize('transport', ['http', 'SSE'])
+def test_parse_args_rejects_invalid_transport_env(monkeypatch, transport):
+    monkeypatch.setenv('MCP_TRANSPORT', transport)
+    with pytest.raises(SystemExit) as exc_info:
+        graphiti_mcp_server.parse_args([])
+    assert exc_info.value.code == 2
+
+
+async def test_lifespan_waits_for_cancelled_init_before_closing(monkeypatch):
+    events = []
+    started = asyncio.Event()
+
+    async def slow_init():
+        started.set()
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await asyncio.sleep(0.01)
+            events.append('init unwound')
+
+    async def close_graphiti():
+        events.append('closed')
+
+    monkeypatch.setattr(graphiti_mcp_server, 'close_graphiti', close_graphiti)
+    app = graphiti_mcp_server.create_sse_app()
+    app.state.graphiti_init = asyncio.create_task(slow_init())
+    await started.wait()
+
+    async with graphiti_mcp_server.lifespan(app):
+        pass
+
+    assert events == ['init unwound', 'closed']
+
+
+async def test_sse_server_cleans_up_when_stopped_during_startup(monkeypatch):
+    events = []
+
+    async def slow_init():
+        try:
+            await asyncio.Event().wait()
+        finally:
+            events.append('init cancelled')
+
+    async def close_graphiti():
+        events.append('closed')
+
+    async def serve(self, sockets=None):
+        await asyncio.sleep(0)
+
+    monkeypatch.setattr(graphiti_mcp_server, 'initialize_graphiti', slow_init)
+    monkeypatch.setattr(graphiti_mcp_server, 'close_graphiti', close_graphiti)
+    monkeypatch.setattr(uvicorn.Server, 'serve', serve)
+
+    await graphiti_mcp_server.run_sse_server()
+
+    assert events == ['init cancelled', 'closed']
+
+
+async def test_concurrency_limit_sheds_excess_sse_connections():
+    entered, release = asyncio.Event(), asyncio.Event()
+
+    async def app(scope, receive, send):
+        entered.set()
+        await release.wait()
+
+    middleware = ConcurrencyLimitMiddleware(app, limit=1)
+    held = asyncio.create_task(middleware(_sse_scope(), _receive, _ignore))
+    await entered.wait()
+
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    await middleware(_sse_scope(), _receive, send)
+    assert sent[0]['status'] == 503
+    assert (b'retry-after', b'1') in sent[0]['headers']
+
+    # Other routes are neither counted nor shed
+    entered.clear()
+    other = asyncio.create_task(middleware(_sse_scope(path='/messages/'), _receive, _ignore))
+    await entered.wait()
+    assert middleware.active == 1
+
+    release.set()
+    await asyncio.gather(held, other)
+    assert middleware.active == 0
+
+
+async def test_concurrency_limit_frees_slot_when_app_raises():
+    async def app(scope, receive, send):
+        raise RuntimeError('boom')
+
+    middleware = ConcurrencyLimitMiddleware(app, limit=1)
+    with pytest.raises(RuntimeError):
+        await middleware(_sse_scope(), _receive, _ignore)
+    assert middleware.active == 0
+
+
+async def test_readiness_gate_rejects_sse_after_timeout():
+    async def app(scope, receive, send):
+        raise AssertionError('app should not be called before ready')
+
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    middleware = ReadinessGateMiddleware(app, ready=asyncio.Event(), timeout=0.01)
+    await middleware(_sse_scope(), _receive, send)
+
+    assert sent[0]['status'] == 503
+    assert (b'retry-after', b'5') in sent[0]['headers']
+
+
+async def test_readiness_gate_passes_sse_through_once_ready():
+    calls = []
+
+    async def app(scope, receive, send):
+        calls.append(scope['path'])
+
+    ready = asyncio.Event()
+    middleware = ReadinessGateMiddleware(app, ready=ready, timeout=1)
+    waiting = asyncio.create_task(middleware(_sse_scope(), _receive, _ignore))
+    await asyncio.sleep(0)
+    assert calls == []
+
+    ready.set()
+    await waiting
+    assert calls == ['/sse']
+
+
+def test_healthz_reports_readiness_without_waiting(monkeypatch):
+    ready = asyncio.Event()
+    monkeypatch.setattr(graphiti_mcp_server, 'graphiti_ready', ready)
+    client = TestClient(graphiti_mcp_server.create_sse_app())
+
+    response = client.get('/healthz')
+    assert response.status_code == 200
+    assert response.json() == {'ready': False}
+
+    ready.set()
+    assert client.get('/healthz').json() == {'ready': True}